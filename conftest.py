@@ -0,0 +1 @@
+"""Pytest configuration: keeps the project root importable from `tests/`."""
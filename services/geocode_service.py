@@ -5,6 +5,8 @@ import os
 import time
 import requests
 
+from services import http_cache
+
 
 def geocode_place(place: str) -> Tuple[float, float, str]:
     """Return (latitude, longitude, display_name) for a place.
@@ -39,7 +41,7 @@ def geocode_place(place: str) -> Tuple[float, float, str]:
     backoff = 1.0
     for attempt in range(1, retries + 2):
         try:
-            resp = requests.get(url, params=params, headers=headers, timeout=10)
+            resp = http_cache.get(url, params=params, headers=headers, timeout=10)
             if resp.status_code == 403:
                 # Provide clear guidance to the caller about why this happened
                 raise RuntimeError(
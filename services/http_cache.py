@@ -0,0 +1,276 @@
+"""Record/replay layer for the HTTP calls made by the services.
+
+All services go through `get` / `post` in this module instead of calling
+`requests` directly. The behaviour is chosen with `configure()` or with
+environment variables:
+
+- `HTTP_CACHE_MODE`: one of
+    - `off` (default): call the live API, nothing is stored.
+    - `record`: call the live API and store every successful response.
+    - `replay`: serve stored responses only; the network is never touched.
+    - `fallback`: call the live API, but serve the last stored response if the
+      request fails or the upstream returns 408, 429 or a 5xx error.
+- `HTTP_CACHE_PATH`: archive file (default `.http_cache.sqlite3`).
+- `HTTP_CACHE_LATENCY_MS`: simulated latency in `replay` mode, either a
+  non-negative number of milliseconds or `recorded` to reuse the latency seen
+  while recording. Fallback answers are served without delay.
+
+The archive is a SQLite file indexed by a request fingerprint; response bodies
+are stored zlib-compressed. Recently replayed bodies are also kept in a bounded
+in-memory LRU so repeated lookups (e.g. load tests) do not hit the disk.
+
+The environment is read when the module is imported, so an invalid setting
+fails at startup with `HttpCacheConfigError`.
+"""
+from collections import OrderedDict
+from typing import Mapping, Optional, Tuple, Union
+import hashlib
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+import zlib
+import requests
+
+
+MODES = ("off", "record", "replay", "fallback")
+
+# Upstream statuses treated as a failed request in fallback mode
+_FALLBACK_STATUSES = frozenset({408, 429})
+
+# Limits for decoded response bodies kept in memory per archive. Entries are
+# evicted once either limit is reached, so memory stays below about 64 MiB even
+# when large Overpass bodies are replayed.
+_MEMORY_SIZE = 1024
+_MEMORY_BYTES = 64 * 1024 * 1024
+
+# Parameters that identify the caller rather than the query; they are left out of
+# the fingerprint so recordings can be shared.
+_IGNORED_PARAMS = frozenset({"email"})
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    fingerprint TEXT PRIMARY KEY,
+    method TEXT NOT NULL,
+    url TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    body BLOB NOT NULL,
+    elapsed_ms REAL NOT NULL,
+    recorded_at REAL NOT NULL
+)
+"""
+
+
+class HttpCacheConfigError(RuntimeError):
+    """Raised for an invalid cache mode or latency setting."""
+
+
+class ReplayMiss(RuntimeError):
+    """Raised in replay mode when no recorded response matches the request."""
+
+
+class CachedResponse:
+    """Minimal stand-in for `requests.Response` built from a recorded entry."""
+
+    def __init__(self, status_code: int, content: bytes, url: str):
+        self.status_code = status_code
+        self.content = content
+        self.url = url
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8")
+
+    def json(self) -> object:
+        return json.loads(self.content)
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}", response=self)
+
+
+Response = Union[requests.Response, CachedResponse]
+
+
+def fingerprint(method: str, url: str, params: Optional[Mapping[str, object]] = None) -> str:
+    """Return a stable hash for a request (method, URL and sorted parameters)."""
+    items = sorted((str(k), str(v)) for k, v in (params or {}).items() if k not in _IGNORED_PARAMS)
+    raw = json.dumps([method.upper(), url, items], separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class HttpArchive:
+    """On-disk archive of HTTP responses with record, replay and fallback modes."""
+
+    def __init__(self, path: str, mode: str = "off", latency_ms: Union[float, str, None] = None):
+        if mode not in MODES:
+            raise HttpCacheConfigError(f"Unknown HTTP cache mode: {mode!r} (expected one of {', '.join(MODES)})")
+        if isinstance(latency_ms, str) and latency_ms != "recorded":
+            raise HttpCacheConfigError(f"Invalid HTTP cache latency: {latency_ms!r} (expected milliseconds or 'recorded')")
+        if not isinstance(latency_ms, str) and latency_ms is not None:
+            if not math.isfinite(latency_ms) or latency_ms < 0:
+                raise HttpCacheConfigError(f"Invalid HTTP cache latency: {latency_ms!r} (expected a non-negative number)")
+        self.path = path
+        self.mode = mode
+        self.latency_ms = latency_ms
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._memory: "OrderedDict[str, Tuple[int, bytes, float]]" = OrderedDict()
+        self._memory_bytes = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(_SCHEMA)
+            self._conn.commit()
+        return self._conn
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            self._memory.clear()
+            self._memory_bytes = 0
+
+    def store(self, key: str, method: str, url: str, status: int, body: bytes, elapsed_ms: float) -> None:
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, method, url, status, zlib.compress(body), elapsed_ms, time.time()),
+            )
+            conn.commit()
+            # Only replay reads fill the memory cache; just drop a stale copy here
+            self._forget(key)
+
+    def _forget(self, key: str) -> None:
+        stale = self._memory.pop(key, None)
+        if stale is not None:
+            self._memory_bytes -= len(stale[1])
+
+    def lookup(self, key: str) -> Optional[Tuple[int, bytes, float]]:
+        """Return (status, body, elapsed_ms) for a fingerprint, or None if not recorded."""
+        with self._lock:
+            hit = self._memory.get(key)
+            if hit is not None:
+                self._memory.move_to_end(key)
+                return hit
+            row = self._connection().execute(
+                "SELECT status, body, elapsed_ms FROM responses WHERE fingerprint = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            hit = (row[0], zlib.decompress(row[1]), row[2])
+            if len(hit[1]) <= _MEMORY_BYTES:
+                self._memory[key] = hit
+                self._memory_bytes += len(hit[1])
+                while len(self._memory) > _MEMORY_SIZE or self._memory_bytes > _MEMORY_BYTES:
+                    _, evicted = self._memory.popitem(last=False)
+                    self._memory_bytes -= len(evicted[1])
+            return hit
+
+    def _replay(self, key: str, url: str, hit: Optional[Tuple[int, bytes, float]]) -> CachedResponse:
+        """Build a response from a looked-up entry; latency is only simulated in replay mode."""
+        if hit is None:
+            raise ReplayMiss(f"No recorded response for {url} (fingerprint {key[:12]})")
+        status, body, elapsed_ms = hit
+        if self.mode == "replay":
+            delay = elapsed_ms if self.latency_ms == "recorded" else self.latency_ms
+            if delay:
+                time.sleep(float(delay) / 1000.0)
+        return CachedResponse(status, body, url)
+
+    def request(self, method: str, url: str, params: Optional[Mapping[str, object]] = None, **kwargs) -> Response:
+        """Perform (or replay) a request according to the archive mode.
+
+        `params` holds the query string for GET and the form body for POST; the
+        remaining keyword arguments are passed to `requests.request` unchanged.
+        """
+        method = method.upper()
+        if self.mode == "off":
+            return _send(method, url, params, **kwargs)
+
+        key = fingerprint(method, url, params)
+        if self.mode == "replay":
+            return self._replay(key, url, self.lookup(key))
+
+        try:
+            started = time.perf_counter()
+            resp = _send(method, url, params, **kwargs)
+            elapsed_ms = (time.perf_counter() - started) * 1000.0
+        except requests.RequestException:
+            hit = self.lookup(key) if self.mode == "fallback" else None
+            if hit is not None:
+                return self._replay(key, url, hit)
+            raise
+
+        if resp.status_code < 400:
+            self.store(key, method, url, resp.status_code, resp.content, elapsed_ms)
+        elif self.mode == "fallback" and (resp.status_code >= 500 or resp.status_code in _FALLBACK_STATUSES):
+            hit = self.lookup(key)
+            if hit is not None:
+                return self._replay(key, url, hit)
+        return resp
+
+
+def _send(method: str, url: str, params: Optional[Mapping[str, object]], **kwargs) -> requests.Response:
+    if method == "GET":
+        return requests.get(url, params=params, **kwargs)
+    return requests.request(method, url, data=params, **kwargs)
+
+
+def _latency_from_env() -> Union[float, str, None]:
+    raw = os.environ.get("HTTP_CACHE_LATENCY_MS", "").strip()
+    if not raw:
+        return None
+    if raw == "recorded":
+        return raw
+    try:
+        return float(raw)
+    except ValueError:
+        raise HttpCacheConfigError(
+            f"Invalid HTTP_CACHE_LATENCY_MS: {raw!r} (expected milliseconds or 'recorded')"
+        ) from None
+
+
+_archive: Optional[HttpArchive] = None
+_archive_lock = threading.RLock()
+
+
+def configure(mode: Optional[str] = None, path: Optional[str] = None, latency_ms: Union[float, str, None] = None) -> HttpArchive:
+    """Replace the process-wide archive. Unset arguments fall back to the environment."""
+    global _archive
+    archive = HttpArchive(
+        path=path or os.environ.get("HTTP_CACHE_PATH", ".http_cache.sqlite3"),
+        mode=mode or os.environ.get("HTTP_CACHE_MODE", "off").strip().lower() or "off",
+        latency_ms=latency_ms if latency_ms is not None else _latency_from_env(),
+    )
+    with _archive_lock:
+        previous, _archive = _archive, archive
+    if previous is not None:
+        previous.close()
+    return archive
+
+
+def get_archive() -> HttpArchive:
+    """Return the process-wide archive."""
+    if _archive is None:
+        with _archive_lock:
+            if _archive is None:
+                return configure()
+    return _archive
+
+
+def get(url: str, params: Optional[Mapping[str, object]] = None, **kwargs) -> Response:
+    return get_archive().request("GET", url, params=params, **kwargs)
+
+
+def post(url: str, data: Optional[Mapping[str, object]] = None, **kwargs) -> Response:
+    return get_archive().request("POST", url, params=data, **kwargs)
+
+
+# Read the environment now so a bad setting fails at startup, not on the first lookup
+configure()
@@ -1,6 +1,7 @@
 """Service to call Overpass API to find nearby places/tourism POIs."""
 from typing import List, Dict
-import requests
+
+from services import http_cache
 
 
 def find_places_near(lat: float, lon: float, radius: int = 2000, limit: int = 20) -> List[Dict[str, object]]:
@@ -22,7 +23,7 @@ def find_places_near(lat: float, lon: float, radius: int = 2000, limit: int = 20
 out center {limit};
 """
 
-    resp = requests.post(overpass_url, data={"data": query}, timeout=30)
+    resp = http_cache.post(overpass_url, data={"data": query}, timeout=30)
     resp.raise_for_status()
     data = resp.json()
 
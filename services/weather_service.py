@@ -1,6 +1,7 @@
 """Service to call Open-Meteo for weather data."""
 from typing import Dict
-import requests
+
+from services import http_cache
 
 
 def get_current_weather(lat: float, lon: float) -> Dict[str, object]:
@@ -15,7 +16,7 @@ def get_current_weather(lat: float, lon: float) -> Dict[str, object]:
         "current_weather": True,
         "timezone": "auto",
     }
-    resp = requests.get(url, params=params, timeout=10)
+    resp = http_cache.get(url, params=params, timeout=10)
     resp.raise_for_status()
     data = resp.json()
 
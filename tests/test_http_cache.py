@@ -0,0 +1,61 @@
+"""Tests for the record/replay HTTP cache layer."""
+import json
+
+import pytest
+import requests
+
+from services import http_cache
+
+
+class _FakeResponse:
+    def __init__(self, body, status_code=200):
+        self.content = json.dumps(body).encode("utf-8")
+        self.status_code = status_code
+
+
+@pytest.fixture
+def archive_path(tmp_path):
+    return str(tmp_path / "archive.sqlite3")
+
+
+def test_record_then_replay(monkeypatch, archive_path):
+    monkeypatch.setattr(requests, "get", lambda url, params=None, **kw: _FakeResponse({"ok": 1}))
+    http_cache.HttpArchive(archive_path, mode="record").request("GET", "https://example.test", {"q": "Paris"})
+
+    def offline(*args, **kwargs):
+        raise AssertionError("replay must not touch the network")
+
+    monkeypatch.setattr(requests, "get", offline)
+    replay = http_cache.HttpArchive(archive_path, mode="replay")
+    assert replay.request("GET", "https://example.test", {"q": "Paris"}).json() == {"ok": 1}
+    with pytest.raises(http_cache.ReplayMiss):
+        replay.request("GET", "https://example.test", {"q": "Rome"})
+
+
+@pytest.mark.parametrize("status", [408, 429, 503])
+def test_fallback_serves_recording_on_upstream_failure(monkeypatch, archive_path, status):
+    archive = http_cache.HttpArchive(archive_path, mode="fallback", latency_ms=10_000)
+    monkeypatch.setattr(requests, "get", lambda url, params=None, **kw: _FakeResponse({"ok": 1}))
+    archive.request("GET", "https://example.test")
+
+    monkeypatch.setattr(requests, "get", lambda url, params=None, **kw: _FakeResponse({}, status))
+    monkeypatch.setattr(http_cache.time, "sleep", lambda s: pytest.fail("fallback must not sleep"))
+    resp = archive.request("GET", "https://example.test")
+    assert resp.status_code == 200
+    assert resp.json() == {"ok": 1}
+
+
+@pytest.mark.parametrize("latency", [-3.0, float("nan"), float("inf"), "abc"])
+def test_invalid_latency_is_rejected(archive_path, latency):
+    with pytest.raises(http_cache.HttpCacheConfigError):
+        http_cache.HttpArchive(archive_path, mode="replay", latency_ms=latency)
+
+
+def test_memory_cache_is_bounded_by_bytes(monkeypatch, archive_path):
+    monkeypatch.setattr(http_cache, "_MEMORY_BYTES", 25)
+    archive = http_cache.HttpArchive(archive_path, mode="replay")
+    for i in range(5):
+        archive.store(str(i), "GET", "https://example.test", 200, b"x" * 10, 1.0)
+        archive.lookup(str(i))
+    assert archive._memory_bytes <= 25
+    assert list(archive._memory) == ["3", "4"]
@@ -0,0 +1,61 @@
+"""Tests for the query parser's intent detection and place extraction."""
+import pytest
+
+from utils.parser import parse_many, parse_query
+
+
+@pytest.mark.parametrize(
+    "query, place",
+    [
+        ("Weather in Paris", "Paris"),
+        ("Paris, France", "Paris, France"),
+        ("Things to do in Kyoto", "Kyoto"),
+        ("things to do kyoto", "kyoto"),
+        ("Asdfghjkl NowhereLand", "Asdfghjkl NowhereLand"),
+        ("Weather in Bahrain", "Bahrain"),
+        ("weather in New Mexico", "New Mexico"),
+        ("things to do in Kochi, India", "Kochi, India"),
+        ("weather in Nice, France", "Nice, France"),
+        ("weather in Paris, Texas", "Paris, Texas"),
+        ("weather in Sydney, Nova Scotia", "Sydney, Nova Scotia"),
+        ("Santiago de Compostela weather", "Santiago de Compostela"),
+        ("Northern Ireland weather", "Northern Ireland"),
+        ("weather in paris and rome", "paris"),
+        ("temperature in Cape Town this weekend", "Cape Town"),
+        ("I am going to Paris next week, what places can I visit", "Paris"),
+        ("best museums in new york city in december", "new york city"),
+        ("weather in Rainy Lake", "Rainy Lake"),
+        ("Snowy Mountains weather", "Snowy Mountains"),
+        ("snowy days Denver", "Denver"),
+        ("cafes near Shibuya station", "Shibuya station"),
+    ],
+)
+def test_place_extraction(query, place):
+    assert parse_query(query)["place"] == place
+
+
+@pytest.mark.parametrize("query", ["weather", "things to do", "   ", ""])
+def test_keyword_only_query_has_no_place(query):
+    assert parse_query(query)["place"] == ""
+
+
+@pytest.mark.parametrize(
+    "query, want_weather, want_places",
+    [
+        ("Weather in Bahrain", True, False),
+        ("Things to do in Bahrain", False, True),
+        ("What are the temperatures in Oslo", True, False),
+        ("forecasts for Lima", True, False),
+        ("snowy days Denver", True, False),
+        ("things  to do in Rome", False, True),
+        ("Paris, France", True, True),
+    ],
+)
+def test_intent_detection(query, want_weather, want_places):
+    parsed = parse_query(query)
+    assert (parsed["want_weather"], parsed["want_places"]) == (want_weather, want_places)
+
+
+def test_parse_many_matches_parse_query():
+    queries = ["Weather in Paris", "things to do kyoto", "Weather in Paris"]
+    assert parse_many(queries) == [parse_query(q) for q in queries]
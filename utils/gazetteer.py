@@ -0,0 +1,87 @@
+"""Small offline gazetteer used by the query parser to spot place names.
+
+Place names are stored in a token trie so the parser can find the longest known
+place span in a query with a single left-to-right scan, without calling any
+external API.
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# Common tourist destinations (cities, regions and countries). The list does not
+# need to be exhaustive: unknown places still fall back to the parser heuristics.
+# Names that double as common words or personal names (e.g. "Turkey", "Washington")
+# are left out.
+KNOWN_PLACES: Tuple[str, ...] = (
+    # Cities
+    "Amsterdam", "Athens", "Auckland", "Bangkok", "Barcelona", "Beijing", "Bengaluru",
+    "Bangalore", "Berlin", "Boston", "Budapest", "Buenos Aires", "Cairo", "Cape Town",
+    "Chennai", "Chicago", "Copenhagen", "Delhi", "New Delhi", "Dubai", "Dublin",
+    "Edinburgh", "Florence", "Goa", "Hanoi", "Ho Chi Minh City", "Hong Kong",
+    "Hyderabad", "Istanbul", "Jaipur", "Jakarta", "Kolkata", "Kuala Lumpur", "Kyoto",
+    "Las Vegas", "Lisbon", "London", "Los Angeles", "Madrid", "Manila", "Marrakech",
+    "Melbourne", "Mexico City", "Miami", "Milan", "Montreal", "Moscow", "Mumbai",
+    "Munich", "Mysore", "Mysuru", "Nairobi", "New York", "New York City", "Osaka",
+    "Oslo", "Paris", "Prague", "Reykjavik", "Rio de Janeiro", "Rome", "San Francisco",
+    "Santiago", "Seattle", "Seoul", "Shanghai", "Singapore", "Stockholm", "Sydney",
+    "Taipei", "Tokyo", "Toronto", "Vancouver", "Venice", "Vienna", "Warsaw", "Zurich",
+    # Countries and regions
+    "Australia", "Brazil", "Canada", "China", "Egypt", "England", "France", "Germany",
+    "Greece", "Iceland", "India", "Indonesia", "Ireland", "Italy", "Japan", "Karnataka",
+    "Kenya", "Malaysia", "Mexico", "Morocco", "Netherlands", "New Zealand", "Norway",
+    "Portugal", "Scotland", "South Africa", "South Korea", "Spain", "Sweden",
+    "Switzerland", "Thailand", "UK", "United Kingdom", "United States", "USA",
+    "Vietnam",
+)
+
+
+_TERMINAL = ""  # tokens are never empty, so "" is a safe end-of-name marker
+
+
+class PlaceTrie:
+    """Token-level trie over place names (case-insensitive)."""
+
+    def __init__(self, names: Iterable[str] = ()):
+        self._root: Dict[str, dict] = {}
+        for name in names:
+            self.add(name)
+
+    def add(self, name: str) -> None:
+        tokens = name.lower().split()
+        if not tokens:
+            return
+        node = self._root
+        for tok in tokens:
+            node = node.setdefault(tok, {})
+        node[_TERMINAL] = name
+
+    def longest_match(self, tokens: List[str], start: int) -> Optional[Tuple[int, str]]:
+        """Return (end, name) for the longest place starting at `tokens[start]`.
+
+        `tokens` must already be lower-cased. `end` is exclusive. Returns None if
+        no known place starts at `start`.
+        """
+        node = self._root
+        best: Optional[Tuple[int, str]] = None
+        for i in range(start, len(tokens)):
+            node = node.get(tokens[i])
+            if node is None:
+                break
+            if _TERMINAL in node:
+                best = (i + 1, node[_TERMINAL])
+        return best
+
+    def find_all(self, tokens: List[str]) -> List[Tuple[int, int]]:
+        """Return non-overlapping (start, end) token spans of known places, left to right."""
+        spans: List[Tuple[int, int]] = []
+        i = 0
+        while i < len(tokens):
+            match = self.longest_match(tokens, i)
+            if match is None:
+                i += 1
+                continue
+            spans.append((i, match[0]))
+            i = match[0]
+        return spans
+
+
+default_trie = PlaceTrie(KNOWN_PLACES)
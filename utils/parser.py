@@ -2,40 +2,159 @@
 
 This parser inspects the user's free-text input and determines whether the user
 is asking for weather, places, or both. It also extracts a likely place name.
+
+Intent keywords are matched with a single precompiled word-boundary regex (so
+"rain" no longer matches "Bahrain"). The place is taken from the text after the
+last "in", or else from the words left once keywords and filler words are removed;
+known place names (see `utils.gazetteer`) trim and pick among the candidates.
 """
-from typing import Dict
+from functools import lru_cache
+import re
+from typing import Dict, Iterable, List, Tuple
 
+from utils.gazetteer import default_trie
 
-def parse_query(query: str) -> Dict[str, object]:
-    """Return a dict with keys: place (str), want_weather (bool), want_places (bool).
 
-    The parser uses simple keyword checks; it's intentionally small and deterministic.
+WEATHER_KEYWORDS: Tuple[str, ...] = ("weather", "temperature", "forecast", "rain", "snow", "sunny")
+PLACES_KEYWORDS: Tuple[str, ...] = (
+    "place", "attraction", "tourist", "things to do", "restaurant", "cafe", "museum",
+)
+
+# Inflected keywords removed from the place. Adjectives such as "rainy" or "snowy"
+# are deliberately absent: they still signal intent but may be part of a place
+# name ("Rainy Lake", "Snowy Mountains").
+_KEYWORD_INFLECTIONS: Tuple[str, ...] = (
+    "temperatures", "forecasts", "rains", "raining", "snowing", "places", "attractions",
+    "tourists", "restaurants", "cafes", "museums",
+)
+
+# Words that carry no place information once intent keywords are removed
+_FILLER_WORDS = frozenset(
     """
-    q = (query or "").strip()
-    q_lower = q.lower()
+    a about am an and any are at best can could day days do find for go going good
+    how i in is it last like list me near nearby next now of on or please see show
+    some tell the there things this to today tomorrow tonight top trip visit want
+    week weekend what what's whats where with
+    january february march april may june july august september october november december
+    monday tuesday wednesday thursday friday saturday sunday summer winter
+    """.split()
+)
+
+
+def _keyword_alternation(keywords: Iterable[str]) -> str:
+    # Longest keywords first so multi-word phrases win over their prefixes
+    ordered = sorted(keywords, key=len, reverse=True)
+    return "|".join(r"\s+".join(re.escape(w) for w in k.split()) for k in ordered)
+
+
+# Intent detection tolerates a plural or simple suffix ("temperatures", "snowy", "raining")
+_INTENT_RE = re.compile(
+    r"\b(?:(?P<weather>" + _keyword_alternation(WEATHER_KEYWORDS) + r")"
+    r"|(?P<places>" + _keyword_alternation(PLACES_KEYWORDS) + r"))(?:s|es|y|ing)?\b"
+)
+# Place extraction only strips the exact keywords and their listed inflections
+_KEYWORD_RE = re.compile(
+    r"\b(?:" + _keyword_alternation(WEATHER_KEYWORDS + PLACES_KEYWORDS + _KEYWORD_INFLECTIONS) + r")\b"
+)
+_TOKEN_RE = re.compile(r"[\w'-]+")
+_IN_RE = re.compile(r"\bin\b")
+
+
+def _place_runs(text: str) -> List[List[Tuple[str, int, int]]]:
+    """Split `text` into runs of consecutive tokens that are neither keywords nor filler words.
+
+    Each run is a list of (token, start_char, end_char). Punctuation does not break
+    a run, so "Paris, Texas" stays one run.
+    """
+    keyword_spans = [m.span() for m in _KEYWORD_RE.finditer(text.lower())]
+    runs: List[List[Tuple[str, int, int]]] = []
+    current: List[Tuple[str, int, int]] = []
+    for m in _TOKEN_RE.finditer(text):
+        tok = m.group()
+        if tok.lower() in _FILLER_WORDS or any(s <= m.start() < e for s, e in keyword_spans):
+            if current:
+                runs.append(current)
+                current = []
+            continue
+        current.append((tok, m.start(), m.end()))
+    if current:
+        runs.append(current)
+    return runs
+
+
+def _trim_run(run: List[Tuple[str, int, int]]) -> Tuple[int, int, bool]:
+    """Return (start_char, end_char, known) for the place within a run.
 
-    weather_keywords = ["weather", "temperature", "forecast", "rain", "snow", "sunny"]
-    places_keywords = ["place", "places", "attraction", "attractions", "tourist", "things to do", "restaurant", "cafe", "museum"]
+    If the run contains a known place followed only by lowercase words, those words
+    are dropped ("Cape Town hotels" -> "Cape Town"); capitalised continuations such
+    as "Paris, Texas" or "Sydney, Nova Scotia" are kept.
+    """
+    spans = default_trie.find_all([t[0].lower() for t in run])
+    if not spans:
+        return run[0][1], run[-1][2], False
+    last_end = spans[-1][1]
+    if all(not t[0][:1].isupper() for t in run[last_end:]):
+        return run[0][1], run[last_end - 1][2], True
+    return run[0][1], run[-1][2], True
+
+
+def _extract_place(text: str) -> Tuple[str, bool]:
+    """Return (place, known) where `known` tells whether the place is in the gazetteer."""
+    raw_runs = _place_runs(text)
+    if not raw_runs:
+        return "", False
+    runs = [_trim_run(r) for r in raw_runs]
+    for start, end, known in runs:
+        if known:
+            return text[start:end], True
+    # No known place to pick: prefer capitalised candidates ("snowy days Denver"),
+    # then keep everything between them
+    capitalised = [t for r, t in zip(raw_runs, runs) if any(tok[:1].isupper() for tok, _, _ in r)]
+    if capitalised:
+        runs = capitalised
+    return text[runs[0][0]:runs[-1][1]], False
 
-    want_weather = any(k in q_lower for k in weather_keywords)
-    want_places = any(k in q_lower for k in places_keywords)
+
+@lru_cache(maxsize=4096)
+def _parse(q: str) -> Tuple[str, bool, bool]:
+    q_lower = q.lower()
+
+    found = {m.lastgroup for m in _INTENT_RE.finditer(q_lower)}
+    want_weather = "weather" in found
+    want_places = "places" in found
 
     # If neither explicitly requested, assume user wants both information types
     if not (want_weather or want_places):
         want_weather = True
         want_places = True
 
-    # Heuristic to extract a place: look for "in <place>" or take the last token group
-    place = ""
-    if " in " in q_lower:
-        # split on ' in ' and take last part
-        place = q_lower.split(" in ")[-1].strip()
-    else:
-        # fallback: use the whole query if short, else take last 3 words
-        tokens = q.split()
-        if len(tokens) <= 4:
-            place = q
-        else:
-            place = " ".join(tokens[-4:])
+    # Prefer the text after the last "in", unless it names no known place and the
+    # rest of the query does. A query made only of keywords and filler words yields
+    # "" so no junk string is geocoded.
+    place, known = "", False
+    in_matches = list(_IN_RE.finditer(q_lower))
+    if in_matches:
+        place, known = _extract_place(q[in_matches[-1].end():])
+    if not known:
+        whole, whole_known = _extract_place(q)
+        if whole_known or not place:
+            place = whole
+
+    return place, want_weather, want_places
 
+
+def parse_query(query: str) -> Dict[str, object]:
+    """Return a dict with keys: place (str), want_weather (bool), want_places (bool).
+
+    The parser uses simple keyword checks; it's intentionally small and deterministic.
+    """
+    place, want_weather, want_places = _parse((query or "").strip())
     return {"place": place, "want_weather": want_weather, "want_places": want_places}
+
+
+def parse_many(queries: Iterable[str]) -> List[Dict[str, object]]:
+    """Parse a batch of queries, returning one `parse_query` result per input in order.
+
+    Repeated queries are parsed once and share the cached result.
+    """
+    return [parse_query(q) for q in queries]